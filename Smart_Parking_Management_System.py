@@ -1,6 +1,10 @@
+import array
 import datetime
-import random
+import itertools
+import json
 import os
+import sys
+from collections import deque
 
 # --- Configuration for ANSI Colors (Dependency-free replacement for colorama) ---
 class Colors:
@@ -26,6 +30,16 @@ MAX_SLOTS = {
     'VIP': 5  # Reserved VIP slots for CAR/EV
 }
 
+# Vehicle types accepted at the gate (VIP is a slot class, not a vehicle type)
+VEHICLE_TYPES = frozenset({'BIKE', 'CAR', 'EV', 'HEAVY'})
+
+# Order of the slot types in the lot columns: VIP slots are prioritized and separated,
+# followed by the standard slots
+SLOT_TYPE_ORDER = ('VIP', 'BIKE', 'CAR', 'EV', 'HEAVY')
+
+# Slot ID prefix for each slot type (e.g., 'C' -> C-01)
+TYPE_PREFIX = {'BIKE': 'B', 'CAR': 'C', 'EV': 'E', 'HEAVY': 'H', 'VIP': 'V'}
+
 # Base Pricing per hour
 # Premium Add-on: Vehicle type-based pricing + Variable pricing (First 2 hours fixed)
 PRICING = {
@@ -36,71 +50,343 @@ PRICING = {
     'VIP': {'FIXED_HOURS': 3, 'FIXED_RATE': 15, 'PER_HOUR': 4} # Discounted per-hour rate for loyalty
 }
 
+# Append-only journal of entries/exits (one JSON object per line), replayed on startup
+# so parked vehicles and the revenue log survive a restart. Kept next to this script so
+# the same journal is used whatever directory the CLI is started from. On a clean shutdown
+# it is compacted to a snapshot (the exits still held in memory + vehicles still parked),
+# which bounds the replay to REVENUE_CAP exits plus one line per slot.
+JOURNAL_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'spms_journal.jsonl')
+
+# Exits kept in memory for the revenue report; once full, the oldest records are overwritten
+REVENUE_CAP = 100_000
+
+# Integer type IDs used in the lot/revenue columns and for billing
+VT_BIKE, VT_CAR, VT_EV, VT_HEAVY, VT_VIP = range(5)
+TYPE_NAMES = ('BIKE', 'CAR', 'EV', 'HEAVY', 'VIP')  # Indexed by type ID
+TYPE_IDS = {name: type_id for type_id, name in enumerate(TYPE_NAMES)}
+
+# PRICING flattened to (FIXED_HOURS, FIXED_RATE, PER_HOUR) tuples indexed by type ID
+PRICING_TABLE = tuple(
+    (PRICING[name]['FIXED_HOURS'], PRICING[name]['FIXED_RATE'], PRICING[name]['PER_HOUR'])
+    for name in TYPE_NAMES
+)
+
+# Erase display + cursor home; handled by the same terminals that render the colors above
+CLEAR_SCREEN = '\033[2J\033[H'
+
+# Color combinations and banners reused on every render, built once at import
+RESET = Colors.RESET
+BLUE_BRIGHT = Colors.BLUE + Colors.BRIGHT
+GREEN_BRIGHT = Colors.GREEN + Colors.BRIGHT
+WHITE_BRIGHT = Colors.WHITE + Colors.BRIGHT
+BANNER_RULE = BLUE_BRIGHT + "=" * 55 + RESET
+SECTION_RULE = "-" * 55
+
+# Status dashboard column widths
+COL_SLOT = 8
+COL_STATUS = 15
+COL_TYPE = 8
+COL_VEHICLE = 20
+
+# Status dashboard header and the rule under it, colored once
+STATUS_HEADER = WHITE_BRIGHT + "{:<{}} {:<{}} {:<{}} {:<{}}".format(
+    "SLOT", COL_SLOT,
+    "STATUS", COL_STATUS,
+    "TYPE", COL_TYPE,
+    "VEHICLE NO", COL_VEHICLE
+) + RESET
+STATUS_RULE = Colors.WHITE + "-" * (COL_SLOT + COL_STATUS + COL_TYPE + COL_VEHICLE + 3) + RESET # 3 for separators
+
+# Daily revenue report column widths (SLOT shares COL_SLOT)
+COL_VEHICLE_REPORT = 12
+COL_TYPE_REPORT = 8
+COL_DURATION = 10
+COL_FEE = 10
+
+# Report header, its rule and the row formatter, with the fixed widths baked into the format spec
+REPORT_HEADER = WHITE_BRIGHT + "{:<{}} {:<{}} {:<{}} {:<{}} {:<{}}".format(
+    "SLOT", COL_SLOT,
+    "VEHICLE", COL_VEHICLE_REPORT,
+    "TYPE", COL_TYPE_REPORT,
+    "DURATION", COL_DURATION,
+    "FEE", COL_FEE
+) + RESET
+REPORT_RULE = Colors.WHITE + "-" * (COL_SLOT + COL_VEHICLE_REPORT + COL_TYPE_REPORT + COL_DURATION + COL_FEE + 4) + RESET # 4 for separators
+REPORT_ROW_FMT = ("{:<%d} {:<%d} {:<%d} {:<%d.1f} {:<%d.2f}" % (
+    COL_SLOT, COL_VEHICLE_REPORT, COL_TYPE_REPORT, COL_DURATION, COL_FEE
+)).format
+
+# Padded, colored STATUS cell shared by every empty slot
+STATUS_AVAILABLE = f"{Colors.GREEN}{'AVAILABLE':<{COL_STATUS}}{RESET}"
+
+# Type column color for non-VIP occupied slots (anything else is YELLOW)
+TYPE_COLORS = {'EV': Colors.GREEN, 'BIKE': Colors.CYAN}
+
 # --- Global State ---
-# Structure: {Slot_ID: {'vehicle_no': str, 'type': str, 'entry_time': datetime.datetime}}
-parking_lot = {}
-revenue_log = []
+# The lot is stored column-wise: row i of every column describes slot SLOT_IDS[i].
+# OCCUPIED/ISVIP hold one byte (0/1) per slot, VTYPE one type ID per slot,
+# and ENTRY holds the entry time as whole epoch seconds.
+SLOT_IDS = []
+SLOT_INDEX = {}  # {Slot_ID: row}
+SORTED_ROWS = []  # Rows ordered by Slot_ID for display (B-01, B-02, C-01, ..., V-01)
+SLOT_TYPE = {}  # {Slot_ID: slot type the slot was built for, e.g. 'VIP'}
+RANGE_OF_TYPE = {}  # {slot type: (first row, end row)}; each type's rows are contiguous
+OCCUPIED = bytearray()
+VNO = []
+VTYPE = bytearray()
+ENTRY = array.array('q')
+ISVIP = bytearray()
+
+# The revenue log is stored column-wise too: entry i of every column is one exit.
+# The columns are ring buffers of REVENUE_CAP records, preallocated at initialization;
+# exit number k is written at k % REVENUE_CAP. Numeric columns are packed arrays (no object per
+# record); builtin sum() would still box every element, so the totals are kept as running sums.
+revenue_count = 0  # Exits logged so far (may exceed REVENUE_CAP)
+revenue_slot_ids = []
+revenue_vehicle_nos = []
+revenue_types = bytearray()  # Type IDs
+revenue_entry = array.array('q')  # Epoch seconds
+revenue_exit = array.array('q')   # Epoch seconds
+revenue_durations = array.array('d')
+revenue_fees = array.array('d')
+# The daily report covers the exits of one calendar day: revenue_day, whose first exit is
+# number revenue_day_start. Running totals over that day's held records, so the report never re-sums the buffers
+revenue_day = None
+revenue_day_start = 0
+revenue_total_fee = 0.0
+revenue_total_hours = 0.0
 total_capacity = sum(MAX_SLOTS.values())
 
+# Secondary indexes kept in sync with the columns so entry/exit never scan the lot
+# FREE: {Slot prefix: deque of available Slot_IDs}, VEHICLE_INDEX: {vehicle_no: Slot_ID}
+FREE = {}
+VEHICLE_INDEX = {}
+
 # --- Utility Functions ---
 
 def clear_screen():
     """Clears the console for a clean UI."""
-    # Note: On some systems, this might not clear the screen entirely,
-    # but it attempts to refresh the display area.
-    os.system('cls' if os.name == 'nt' else 'clear')
+    sys.stdout.write(CLEAR_SCREEN)
+    sys.stdout.flush()
+
+def write_lines(lines):
+    """Writes a whole rendered screen to stdout in a single call."""
+    lines.append('')
+    sys.stdout.write("\n".join(lines))
+    sys.stdout.flush()
 
 def generate_slot_id(vehicle_type, index):
     """Generates a structured Slot ID (e.g., C-01, V-03)."""
-    prefix = vehicle_type[0].upper()
-    if vehicle_type == 'EV':
-        prefix = 'E'
-    elif vehicle_type == 'HEAVY':
-        prefix = 'H'
-    elif vehicle_type == 'VIP':
-        prefix = 'V'
-    return f"{prefix}-{index:02d}"
+    return f"{TYPE_PREFIX[vehicle_type]}-{index:02d}"
 
 def initialize_parking_lot():
-    """Creates the initial, empty slot dictionary with structured IDs."""
-    global parking_lot
-    parking_lot = {}
-    index_map = {'BIKE': 1, 'CAR': 1, 'EV': 1, 'HEAVY': 1, 'VIP': 1}
-
-    # VIP slots are prioritized and separated
-    for _ in range(MAX_SLOTS['VIP']):
-        slot_id = generate_slot_id('VIP', index_map['VIP'])
-        parking_lot[slot_id] = None
-        index_map['VIP'] += 1
-
-    # Standard slots
-    for v_type in ['BIKE', 'CAR', 'EV', 'HEAVY']:
-        for _ in range(MAX_SLOTS[v_type]):
-            slot_id = generate_slot_id(v_type, index_map[v_type])
-            parking_lot[slot_id] = None
-            index_map[v_type] += 1
-
-    # Shuffle for a non-sequential allocation feel
-    shuffled_keys = list(parking_lot.keys())
-    random.shuffle(shuffled_keys)
-    # Recreate the dictionary to apply the shuffled order while maintaining structure
-    temp_lot = {k: parking_lot[k] for k in shuffled_keys}
-    parking_lot = temp_lot
-
-def calculate_fee(entry_time, exit_time, vehicle_type):
+    """Creates the initial, empty slot columns with structured IDs and an empty revenue log."""
+    global SLOT_IDS, SLOT_INDEX, SORTED_ROWS, SLOT_TYPE, RANGE_OF_TYPE, OCCUPIED, VNO, VTYPE, ENTRY, ISVIP
+    global revenue_count, revenue_slot_ids, revenue_vehicle_nos, revenue_types, revenue_entry, revenue_exit
+    global revenue_durations, revenue_fees, revenue_day, revenue_day_start, revenue_total_fee, revenue_total_hours
+    # Each type occupies one contiguous run of rows, in SLOT_TYPE_ORDER and slot-number order
+    SLOT_TYPE = {}
+    RANGE_OF_TYPE = {}
+    for v_type in SLOT_TYPE_ORDER:
+        start = len(SLOT_TYPE)
+        for index in range(1, MAX_SLOTS[v_type] + 1):
+            SLOT_TYPE[generate_slot_id(v_type, index)] = v_type
+        RANGE_OF_TYPE[v_type] = (start, len(SLOT_TYPE))
+    slot_ids = list(SLOT_TYPE)
+    slot_count = len(slot_ids)
+    SLOT_IDS = slot_ids
+    SLOT_INDEX = {slot_id: row for row, slot_id in enumerate(slot_ids)}
+    SORTED_ROWS = sorted(range(slot_count), key=slot_ids.__getitem__)
+    OCCUPIED = bytearray(slot_count)
+    VNO = [''] * slot_count
+    VTYPE = bytearray(slot_count)
+    ENTRY = array.array('q', [0]) * slot_count
+    ISVIP = bytearray(slot_count)
+
+    # Build the free-slot queues in allocation order and reset the vehicle index
+    FREE.clear()
+    for prefix in TYPE_PREFIX.values():
+        FREE[prefix] = deque()
+    for slot_id in SLOT_IDS:
+        FREE[slot_id[0]].append(slot_id)
+    VEHICLE_INDEX.clear()
+
+    # Start with an empty revenue log
+    revenue_count = 0
+    revenue_slot_ids = [''] * REVENUE_CAP
+    revenue_vehicle_nos = [''] * REVENUE_CAP
+    revenue_types = bytearray(REVENUE_CAP)
+    revenue_entry = array.array('q', [0]) * REVENUE_CAP
+    revenue_exit = array.array('q', [0]) * REVENUE_CAP
+    revenue_durations = array.array('d', [0.0]) * REVENUE_CAP
+    revenue_fees = array.array('d', [0.0]) * REVENUE_CAP
+    revenue_day = None
+    revenue_day_start = 0
+    revenue_total_fee = 0.0
+    revenue_total_hours = 0.0
+
+def occupy_slot(slot_id, vehicle_no, type_id, entry_ts, is_vip):
+    """Records a parked vehicle in the lot columns and the vehicle index."""
+    row = SLOT_INDEX[slot_id]
+    OCCUPIED[row] = 1
+    VNO[row] = vehicle_no
+    VTYPE[row] = type_id
+    ENTRY[row] = entry_ts
+    ISVIP[row] = is_vip
+    VEHICLE_INDEX[vehicle_no] = slot_id
+
+def log_revenue(slot_id, vehicle_no, type_id, entry_ts, exit_ts, total_hours, fee):
+    """Writes one finished stay into the next revenue ring-buffer record."""
+    global revenue_count, revenue_day, revenue_day_start, revenue_total_fee, revenue_total_hours
+    exit_day = datetime.date.fromtimestamp(exit_ts)
+    if exit_day != revenue_day:
+        # First exit of a new day: the totals start over from this record
+        revenue_day = exit_day
+        revenue_day_start = revenue_count
+        revenue_total_fee = 0.0
+        revenue_total_hours = 0.0
+
+    i = revenue_count % REVENUE_CAP
+    if revenue_count - REVENUE_CAP >= revenue_day_start:
+        # The buffer has wrapped onto one of today's records: it is overwritten, so it leaves the totals
+        revenue_total_fee -= revenue_fees[i]
+        revenue_total_hours -= revenue_durations[i]
+    revenue_slot_ids[i] = slot_id
+    revenue_vehicle_nos[i] = vehicle_no
+    revenue_types[i] = type_id
+    revenue_entry[i] = entry_ts
+    revenue_exit[i] = exit_ts
+    revenue_durations[i] = total_hours
+    revenue_fees[i] = fee
+    revenue_count += 1
+    revenue_total_fee += fee
+    revenue_total_hours += total_hours
+
+def revenue_rows(first=0):
+    """Ring-buffer indexes of the exits still held from exit number `first` on, oldest first."""
+    # Older exits have been overwritten once the buffer wrapped
+    first = max(first, revenue_count - REVENUE_CAP)
+    start = first % REVENUE_CAP
+    end = start + revenue_count - first
+    if end <= REVENUE_CAP:
+        return range(start, end)
+    return itertools.chain(range(start, REVENUE_CAP), range(end - REVENUE_CAP))
+
+def release_slot(slot_id, exit_ts, total_hours, fee):
+    """Logs the finished stay to the revenue columns and returns the slot to its free queue."""
+    row = SLOT_INDEX[slot_id]
+    log_revenue(slot_id, VNO[row], VTYPE[row], ENTRY[row], exit_ts, total_hours, fee)
+
+    OCCUPIED[row] = 0
+    VNO[row] = ''
+    VTYPE[row] = 0
+    ISVIP[row] = 0
+    FREE[slot_id[0]].append(slot_id)
+
+def record_event(event):
+    """Appends one entry/exit event to the journal."""
+    line = json.dumps(event) + "\n"
+    try:
+        with open(JOURNAL_FILE, 'ab+') as journal:
+            # A crash mid-write can leave an unterminated last line; end it first so the
+            # new event starts on its own line instead of being glued onto the fragment
+            if journal.seek(0, os.SEEK_END):
+                journal.seek(-1, os.SEEK_END)
+                if journal.read(1) != b"\n":
+                    line = "\n" + line
+            journal.write(line.encode())
+    except OSError as error:
+        # The lot has already been updated in memory; keep running and tell the operator
+        print(Colors.YELLOW + f"\n[WARN] Could not write to the journal ({error}). This change will not survive a restart." + RESET)
+
+def compact_journal():
+    """
+    Rewrites the journal as a snapshot of the current state: a 'revenue' record for each
+    exit still held in memory (whatever its day), then an 'entry' record for each vehicle still parked.
+    """
+    events = []
+    for i in revenue_rows():
+        events.append({
+            'op': 'revenue',
+            'slot_id': revenue_slot_ids[i],
+            'vehicle_no': revenue_vehicle_nos[i],
+            'type': TYPE_NAMES[revenue_types[i]],
+            'entry_ts': revenue_entry[i],
+            'exit_ts': revenue_exit[i],
+            'duration_hrs': revenue_durations[i],
+            'fee': revenue_fees[i]
+        })
+    for row, slot_id in enumerate(SLOT_IDS):
+        if OCCUPIED[row]:
+            events.append({
+                'op': 'entry',
+                'slot_id': slot_id,
+                'vehicle_no': VNO[row],
+                'type': TYPE_NAMES[VTYPE[row]],
+                'entry_ts': ENTRY[row],
+                'is_vip': bool(ISVIP[row])
+            })
+
+    # Write the snapshot beside the journal and swap it in, so a crash leaves one or the other intact
+    snapshot_file = JOURNAL_FILE + '.tmp'
+    try:
+        with open(snapshot_file, 'w') as snapshot:
+            snapshot.write("".join(json.dumps(event) + "\n" for event in events))
+        os.replace(snapshot_file, JOURNAL_FILE)
+    except OSError as error:
+        print(Colors.YELLOW + f"\n[WARN] Could not compact the journal ({error}). It will be replayed in full on the next start." + RESET)
+
+def replay_event(event):
+    """Applies one journal event to the lot. Raises KeyError/TypeError/ValueError for a malformed event."""
+    # Every field is read and converted before anything is changed, so a bad event leaves no partial state
+    if event['op'] == 'entry':
+        slot_id, vehicle_no = event['slot_id'], event['vehicle_no']
+        type_id, entry_ts, is_vip = TYPE_IDS[event['type']], int(event['entry_ts']), bool(event['is_vip'])
+        row = SLOT_INDEX.get(slot_id)
+        # Skip slots that no longer exist (MAX_SLOTS changed) or clash with replayed state
+        if row is None or OCCUPIED[row] or vehicle_no in VEHICLE_INDEX:
+            return
+        FREE[slot_id[0]].remove(slot_id)
+        occupy_slot(slot_id, vehicle_no, type_id, entry_ts, is_vip)
+    elif event['op'] == 'exit':
+        exit_ts, total_hours, fee = int(event['exit_ts']), float(event['duration_hrs']), float(event['fee'])
+        slot_id = VEHICLE_INDEX.pop(event['vehicle_no'], None)
+        if slot_id:
+            release_slot(slot_id, exit_ts, total_hours, fee)
+    elif event['op'] == 'revenue':
+        # A finished stay carried over by compact_journal (its entry is no longer in the journal)
+        log_revenue(
+            event['slot_id'], event['vehicle_no'], TYPE_IDS[event['type']], int(event['entry_ts']),
+            int(event['exit_ts']), float(event['duration_hrs']), float(event['fee'])
+        )
+
+def restore_state():
+    """
+    Replays the journal into a freshly initialized lot (entries re-park, exits re-log revenue).
+    Returns the warnings for skipped lines, for the caller to show once the screen is drawn.
+    """
+    warnings = []
+    if not os.path.exists(JOURNAL_FILE):
+        return warnings
+
+    with open(JOURNAL_FILE) as journal:
+        for line_no, line in enumerate(journal, 1):
+            try:
+                replay_event(json.loads(line))
+            except (KeyError, TypeError, ValueError):
+                # e.g., a line cut short by a crash mid-write; the lines around it are still valid
+                warnings.append(Colors.YELLOW + f"[WARN] Journal line {line_no} is unreadable or malformed; skipping it." + RESET)
+    return warnings
+
+def calculate_fee(entry_ts, exit_ts, type_id):
     """
     Calculates the parking fee using the variable pricing model.
-    Time Tracking (entry_time) and Billing Engine (fee calculation).
+    Time Tracking (entry_ts/exit_ts as integer epoch seconds) and Billing Engine (fee calculation).
     """
-    duration = exit_time - entry_time
-    total_seconds = duration.total_seconds()
     # Round up to the nearest hour for billing
-    total_hours = max(1, (total_seconds + 3599) // 3600)
+    total_hours = max(1, (exit_ts - entry_ts + 3599) // 3600)
 
-    pricing_scheme = PRICING.get(vehicle_type, PRICING['CAR']) # Default to CAR pricing
-    fixed_hours = pricing_scheme['FIXED_HOURS']
-    fixed_rate = pricing_scheme['FIXED_RATE']
-    per_hour_rate = pricing_scheme['PER_HOUR']
+    fixed_hours, fixed_rate, per_hour_rate = PRICING_TABLE[type_id]
 
     if total_hours <= fixed_hours:
         fee = fixed_rate
@@ -118,28 +404,22 @@ def find_available_slot(vehicle_type, is_vip=False):
     Slot Allocation.
     """
     # 1. Priority check for VIP slots (for VIP vehicles only)
-    if is_vip:
-        for slot_id, status in parking_lot.items():
-            if slot_id.startswith('V-') and status is None:
-                return slot_id, 'VIP'
+    if is_vip and FREE['V']:
+        return FREE['V'].popleft(), 'VIP'
 
     # 2. Check for type-specific slots
-    type_prefix = vehicle_type[0].upper()
-    if vehicle_type == 'EV': type_prefix = 'E'
-    elif vehicle_type == 'HEAVY': type_prefix = 'H'
+    type_prefix = TYPE_PREFIX[vehicle_type]
 
-    for slot_id, status in parking_lot.items():
-        if slot_id.startswith(f'{type_prefix}-') and status is None:
-            return slot_id, vehicle_type
+    if FREE[type_prefix]:
+        return FREE[type_prefix].popleft(), vehicle_type
 
     # 3. Fallback: Check for any open 'CAR' or 'VIP' slot (for CAR/EV if type-specific is full)
     if vehicle_type in ['CAR', 'EV']:
-        for slot_id, status in parking_lot.items():
-            # Allow CAR/EV to spill over into standard CAR slots or VIP slots
-            if (slot_id.startswith('C-') or slot_id.startswith('V-')) and status is None:
-                # Note: We still store the original vehicle_type ('CAR' or 'EV')
-                # If it's a VIP slot, we treat it as a CAR-type for general allocation here
-                return slot_id, parking_lot.get(slot_id, {}).get('type', vehicle_type)
+        # Allow CAR/EV to spill over into standard CAR slots or VIP slots
+        # Note: We still store the original vehicle_type ('CAR' or 'EV')
+        for prefix in ('C', 'V'):
+            if FREE[prefix]:
+                return FREE[prefix].popleft(), vehicle_type
 
     # 4. General fallback (e.g., BIKE in a CAR slot if allowed, but keeping it simple here)
     # The current structured allocation is strict by design for better management.
@@ -148,126 +428,119 @@ def find_available_slot(vehicle_type, is_vip=False):
 # --- Core Management Functions ---
 
 def vehicle_entry(vehicle_no, vehicle_type, is_vip=False):
-    """Handles vehicle entry and slot assignment."""
+    """Handles vehicle entry and slot assignment. Returns True if the vehicle was parked."""
     vehicle_type = vehicle_type.upper()
     vehicle_no = vehicle_no.upper()
 
-    if vehicle_type not in ['BIKE', 'CAR', 'EV', 'HEAVY']:
-        print(Colors.RED + "\n[ERROR] Invalid vehicle type. Must be BIKE, CAR, EV, or HEAVY." + Colors.RESET)
-        return
+    if vehicle_type not in VEHICLE_TYPES:
+        print(Colors.RED + "\n[ERROR] Invalid vehicle type. Must be BIKE, CAR, EV, or HEAVY." + RESET)
+        return False
 
-    # Validation: Check if vehicle is already parked
-    for slot_id, info in parking_lot.items():
-        if info and info['vehicle_no'] == vehicle_no:
-            print(Colors.YELLOW + f"\n[WARN] Vehicle {vehicle_no} is already parked in Slot {slot_id}." + Colors.RESET)
-            return
+    # Validation: Check if vehicle is already parked (before touching the lot)
+    parked_slot_id = VEHICLE_INDEX.get(vehicle_no)
+    if parked_slot_id:
+        print(Colors.YELLOW + f"\n[WARN] Vehicle {vehicle_no} is already parked in Slot {parked_slot_id}." + RESET)
+        return False
 
     # Find the slot
     slot_id, allocated_type = find_available_slot(vehicle_type, is_vip)
 
     if slot_id:
         entry_time = datetime.datetime.now()
-        parking_lot[slot_id] = {
+        entry_ts = int(entry_time.timestamp())
+        occupy_slot(slot_id, vehicle_no, TYPE_IDS[vehicle_type], entry_ts, is_vip)
+        record_event({
+            'op': 'entry',
+            'slot_id': slot_id,
             'vehicle_no': vehicle_no,
             'type': vehicle_type,
-            'entry_time': entry_time,
+            'entry_ts': entry_ts,
             'is_vip': is_vip
-        }
+        })
         status_color = Colors.CYAN if is_vip else Colors.GREEN
-        print(status_color + Colors.BRIGHT + f"\n[SUCCESS] Vehicle {vehicle_no} ({vehicle_type}) entered." + Colors.RESET)
-        print(status_color + f"Allocated Slot: {slot_id} | Entry Time: {entry_time.strftime('%Y-%m-%d %H:%M:%S')}" + Colors.RESET)
+        print(status_color + Colors.BRIGHT + f"\n[SUCCESS] Vehicle {vehicle_no} ({vehicle_type}) entered." + RESET)
+        print(status_color + f"Allocated Slot: {slot_id} | Entry Time: {entry_time.strftime('%Y-%m-%d %H:%M:%S')}" + RESET)
+        return True
     else:
-        print(Colors.RED + "\n[FAILURE] Parking lot is full for the requested vehicle type." + Colors.RESET)
+        print(Colors.RED + "\n[FAILURE] Parking lot is full for the requested vehicle type." + RESET)
+        return False
 
 def vehicle_exit(vehicle_no):
-    """Handles vehicle exit, fee calculation, and slot freeing."""
+    """Handles vehicle exit, fee calculation, and slot freeing. Returns True if the vehicle exited."""
     vehicle_no = vehicle_no.upper()
 
     # Find the vehicle by number
-    found_slot_id = None
-    for slot_id, info in parking_lot.items():
-        if info and info['vehicle_no'] == vehicle_no:
-            found_slot_id = slot_id
-            break
+    found_slot_id = VEHICLE_INDEX.pop(vehicle_no, None)
 
     # Validation: Check for missing vehicle
     if not found_slot_id:
-        print(Colors.RED + f"\n[ERROR] Vehicle {vehicle_no} not found in the parking lot." + Colors.RESET)
-        return
+        print(Colors.RED + f"\n[ERROR] Vehicle {vehicle_no} not found in the parking lot." + RESET)
+        return False
 
     # Process Exit Clearance
-    exit_time = datetime.datetime.now()
-    info = parking_lot[found_slot_id]
-    entry_time = info['entry_time']
-    v_type = info['type']
+    exit_ts = int(datetime.datetime.now().timestamp())
+    row = SLOT_INDEX[found_slot_id]
+    entry_ts = ENTRY[row]
+    type_id = VTYPE[row]
+    v_type = TYPE_NAMES[type_id]
 
     # Calculate Fee
-    fee, total_hours = calculate_fee(entry_time, exit_time, v_type)
+    fee, total_hours = calculate_fee(entry_ts, exit_ts, type_id)
 
-    # Log Revenue
-    revenue_log.append({
+    # Log Revenue and free up the slot
+    release_slot(found_slot_id, exit_ts, total_hours, fee)
+    record_event({
+        'op': 'exit',
         'vehicle_no': vehicle_no,
-        'type': v_type,
-        'slot_id': found_slot_id,
-        'entry_time': entry_time,
-        'exit_time': exit_time,
+        'exit_ts': exit_ts,
         'duration_hrs': total_hours,
         'fee': fee
     })
 
-    # Free up the slot
-    parking_lot[found_slot_id] = None
-
     # Display Exit Report
-    print(Colors.GREEN + Colors.BRIGHT + f"\n[EXIT REPORT] Vehicle {vehicle_no} Exited from Slot {found_slot_id}" + Colors.RESET)
-    print(Colors.GREEN + "--------------------------------------------------------" + Colors.RESET)
-    print(Colors.YELLOW + f"  Vehicle Type: {v_type}" + Colors.RESET)
-    print(Colors.YELLOW + f"  Duration (Hrs): {total_hours}" + Colors.RESET)
-    print(Colors.YELLOW + f"  Total Fee: ${fee:.2f}" + Colors.RESET)
-    print(Colors.GREEN + "--------------------------------------------------------" + Colors.RESET)
-    print(Colors.MAGENTA + f"  Thank you for parking with us!" + Colors.RESET)
+    print(Colors.GREEN + Colors.BRIGHT + f"\n[EXIT REPORT] Vehicle {vehicle_no} Exited from Slot {found_slot_id}" + RESET)
+    print(Colors.GREEN + "--------------------------------------------------------" + RESET)
+    print(Colors.YELLOW + f"  Vehicle Type: {v_type}" + RESET)
+    print(Colors.YELLOW + f"  Duration (Hrs): {total_hours}" + RESET)
+    print(Colors.YELLOW + f"  Total Fee: ${fee:.2f}" + RESET)
+    print(Colors.GREEN + "--------------------------------------------------------" + RESET)
+    print(Colors.MAGENTA + f"  Thank you for parking with us!" + RESET)
+    return True
 
 
-def display_status():
+def display_status(clear=True):
     """Displays the current parking lot occupancy and status."""
-    clear_screen()
-    print(Colors.BLUE + Colors.BRIGHT + "=======================================================" + Colors.RESET)
-    print(Colors.BLUE + Colors.BRIGHT + "         SMART PARKING LOT STATUS DASHBOARD            " + Colors.RESET)
-    print(Colors.BLUE + Colors.BRIGHT + "=======================================================" + Colors.RESET)
+    # Clear the screen as part of the same write as the rendered screen
+    out = [CLEAR_SCREEN + BANNER_RULE if clear else BANNER_RULE]
+    out.append(BLUE_BRIGHT + "         SMART PARKING LOT STATUS DASHBOARD            " + RESET)
+    out.append(BANNER_RULE)
 
-    occupied_count = sum(1 for status in parking_lot.values() if status is not None)
+    occupied_count = OCCUPIED.count(1)
     available_count = total_capacity - occupied_count
     utilization = (occupied_count / total_capacity) * 100 if total_capacity else 0
 
-    print(Colors.CYAN + f"Total Capacity: {total_capacity} | Occupied: {occupied_count} | Available: {available_count}" + Colors.RESET)
-    print(Colors.CYAN + f"Utilization: {utilization:.2f}%" + Colors.RESET)
-    print("-" * 55)
+    out.append(Colors.CYAN + f"Total Capacity: {total_capacity} | Occupied: {occupied_count} | Available: {available_count}" + RESET)
+    out.append(Colors.CYAN + f"Utilization: {utilization:.2f}%" + RESET)
+    # Per-type occupancy, counted directly over each type's run of rows
+    by_type = " | ".join(
+        f"{v_type} {OCCUPIED.count(1, start, end)}/{end - start}"
+        for v_type, (start, end) in RANGE_OF_TYPE.items()
+    )
+    out.append(Colors.CYAN + f"By Type: {by_type}" + RESET)
+    out.append(SECTION_RULE)
 
-    # Column definitions
-    COL_SLOT = 8
-    COL_STATUS = 15
-    COL_TYPE = 8
-    COL_VEHICLE = 20
-    
     # Detailed Slot View (Optimized for readability and strict alignment)
     # Header: SLOT     STATUS          TYPE     VEHICLE NO
-    header = "{:<{}} {:<{}} {:<{}} {:<{}}".format(
-        "SLOT", COL_SLOT, 
-        "STATUS", COL_STATUS, 
-        "TYPE", COL_TYPE, 
-        "VEHICLE NO", COL_VEHICLE
-    )
-    print(Colors.WHITE + Colors.BRIGHT + header + Colors.RESET)
-    print(Colors.WHITE + "-" * (COL_SLOT + COL_STATUS + COL_TYPE + COL_VEHICLE + 3) + Colors.RESET) # 3 for separators
+    out.append(STATUS_HEADER)
+    out.append(STATUS_RULE)
 
-    # Sort slots by ID for easier visual tracking (e.g., B-01, B-02, C-01, V-01)
-    sorted_slots = sorted(parking_lot.items(), key=lambda item: item[0])
-
-    for slot_id, info in sorted_slots:
-        if info:
-            v_type = info['type']
-            v_no = info['vehicle_no']
-            is_vip = info.get('is_vip', False)
+    # Slots in ID order for easier visual tracking (sorted once at initialization)
+    for row in SORTED_ROWS:
+        slot_id = SLOT_IDS[row]
+        if OCCUPIED[row]:
+            v_type = TYPE_NAMES[VTYPE[row]]
+            v_no = VNO[row]
+            is_vip = ISVIP[row]
 
             # Determine status and color
             if is_vip:
@@ -277,106 +550,164 @@ def display_status():
             else:
                 status_text = "OCCUPIED"
                 status_color = Colors.RED
-                if v_type == 'EV':
-                    type_color = Colors.GREEN
-                elif v_type == 'BIKE':
-                    type_color = Colors.CYAN
-                else:
-                    type_color = Colors.YELLOW
-            
-            # Use fixed width formatting for data fields
-            line = "{:<{}} {}{:<{}}{} {:<{}} {:<{}}".format(
-                slot_id, COL_SLOT,
-                status_color, status_text, COL_STATUS, Colors.RESET, # Apply color within formatting block for accurate width
-                type_color + v_type + Colors.RESET, COL_TYPE,
-                Colors.WHITE + v_no + Colors.RESET, COL_VEHICLE
+                type_color = TYPE_COLORS.get(v_type, Colors.YELLOW)
+
+            # Pad the bare text, then wrap it in color, so escape codes don't count towards the width
+            line = (
+                f"{slot_id:<{COL_SLOT}} {status_color}{status_text:<{COL_STATUS}}{RESET} "
+                f"{type_color}{v_type:<{COL_TYPE}}{RESET} {Colors.WHITE}{v_no:<{COL_VEHICLE}}{RESET}"
             )
-            print(line)
+            out.append(line)
         else:
-            # Determine the original intended type for the empty slot for context
-            intended_type = 'UNKNOWN'
-            if slot_id.startswith('B-'): intended_type = 'BIKE'
-            elif slot_id.startswith('C-'): intended_type = 'CAR'
-            elif slot_id.startswith('E-'): intended_type = 'EV'
-            elif slot_id.startswith('H-'): intended_type = 'HEAVY'
-            elif slot_id.startswith('V-'): intended_type = 'VIP'
-            
+            # The original intended type for the empty slot, for context
+            intended_type = SLOT_TYPE[slot_id]
+
             # Available Slot Formatting
-            line = "{:<{}} {}{:<{}}{} {:<{}} {:<{}}".format(
-                Colors.WHITE + slot_id + Colors.RESET, COL_SLOT,
-                Colors.GREEN, "AVAILABLE", COL_STATUS, Colors.RESET,
-                Colors.RESET + intended_type, COL_TYPE,
-                "", COL_VEHICLE
-            )
-            print(line)
-    print("-" * 55)
+            line = f"{Colors.WHITE}{slot_id:<{COL_SLOT}}{RESET} {STATUS_AVAILABLE} {intended_type}"
+            out.append(line)
+    out.append(SECTION_RULE)
+    write_lines(out)
 
-def display_daily_report():
+def display_daily_report(clear=True):
     """Generates and displays the Daily Revenue Report."""
-    clear_screen()
-    print(Colors.BLUE + Colors.BRIGHT + "=======================================================" + Colors.RESET)
-    print(Colors.BLUE + Colors.BRIGHT + "            DAILY REVENUE REPORT                       " + Colors.RESET)
-    print(Colors.BLUE + Colors.BRIGHT + "=======================================================" + Colors.RESET)
-
-    if not revenue_log:
-        print(Colors.YELLOW + "No transactions recorded yet for the day." + Colors.RESET)
-        print("-" * 55)
+    # Clear the screen as part of the same write as the rendered screen
+    out = [CLEAR_SCREEN + BANNER_RULE if clear else BANNER_RULE]
+    out.append(BLUE_BRIGHT + "            DAILY REVENUE REPORT                       " + RESET)
+    out.append(BANNER_RULE)
+
+    # Today's exits, of which the ring buffer holds at most the latest REVENUE_CAP
+    today_count = revenue_count - revenue_day_start if revenue_day == datetime.date.today() else 0
+    total_vehicles = min(today_count, REVENUE_CAP)
+    if not total_vehicles:
+        out.append(Colors.YELLOW + "No transactions recorded yet for the day." + RESET)
+        out.append(SECTION_RULE)
+        write_lines(out)
         return
 
-    total_revenue = sum(item['fee'] for item in revenue_log)
-    total_vehicles = len(revenue_log)
-    avg_duration = sum(item['duration_hrs'] for item in revenue_log) / total_vehicles if total_vehicles else 0
-
-    print(Colors.GREEN + f"Total Revenue Earned: {Colors.GREEN + Colors.BRIGHT}${total_revenue:.2f}" + Colors.RESET)
-    print(Colors.GREEN + f"Total Vehicles Processed: {total_vehicles}" + Colors.RESET)
-    print(Colors.GREEN + f"Average Parking Duration: {avg_duration:.1f} hours" + Colors.RESET)
-    print("-" * 55)
-
-    # Column definitions for report
-    COL_SLOT = 8
-    COL_VEHICLE_REPORT = 12
-    COL_TYPE_REPORT = 8
-    COL_DURATION = 10
-    COL_FEE = 10
-    
+    # Kept up to date by log_revenue, so the report does no per-record work for the totals
+    total_revenue = revenue_total_fee
+    avg_duration = revenue_total_hours / total_vehicles
+
+    # Once the buffer has wrapped, the totals only cover the records it still holds
+    window = f" (last {REVENUE_CAP} exits)" if today_count > REVENUE_CAP else ""
+    out.append(Colors.GREEN + f"Total Revenue Earned{window}: {GREEN_BRIGHT}${total_revenue:.2f}" + RESET)
+    out.append(Colors.GREEN + f"Total Vehicles Processed{window}: {total_vehicles}" + RESET)
+    out.append(Colors.GREEN + f"Average Parking Duration: {avg_duration:.1f} hours" + RESET)
+    if today_count > REVENUE_CAP:
+        out.append(Colors.YELLOW + f"(Only the latest {REVENUE_CAP} of today's {today_count} transactions are kept for this report)" + RESET)
+    out.append(SECTION_RULE)
+
     # Detailed Transaction List Header: SLOT     VEHICLE    TYPE     DURATION   FEE
-    header = "{:<{}} {:<{}} {:<{}} {:<{}} {:<{}}".format(
-        "SLOT", COL_SLOT, 
-        "VEHICLE", COL_VEHICLE_REPORT, 
-        "TYPE", COL_TYPE_REPORT, 
-        "DURATION", COL_DURATION, 
-        "FEE", COL_FEE
-    )
-    print(Colors.WHITE + Colors.BRIGHT + header + Colors.RESET)
-    print(Colors.WHITE + "-" * (COL_SLOT + COL_VEHICLE_REPORT + COL_TYPE_REPORT + COL_DURATION + COL_FEE + 4) + Colors.RESET) # 4 for separators
+    out.append(REPORT_HEADER)
+    out.append(REPORT_RULE)
 
-    for record in revenue_log:
+    # Oldest record first
+    for i in revenue_rows(revenue_day_start):
         # Data rows for report
-        print("{:<{}} {:<{}} {:<{}} {:<{}.1f} {:<{}.2f}".format(
-            record['slot_id'], COL_SLOT,
-            record['vehicle_no'], COL_VEHICLE_REPORT,
-            record['type'], COL_TYPE_REPORT,
-            record['duration_hrs'], COL_DURATION,
-            record['fee'], COL_FEE
+        out.append(REPORT_ROW_FMT(
+            revenue_slot_ids[i], revenue_vehicle_nos[i], TYPE_NAMES[revenue_types[i]],
+            revenue_durations[i], revenue_fees[i]
         ))
-    print("-" * 55)
+    out.append(SECTION_RULE)
+    write_lines(out)
+
+
+# --- Batch Mode ---
+
+def batch_mode(stream=None):
+    """
+    Processes newline-delimited commands without menus, screen clears or pauses
+    (e.g., a gate controller piping in events). One command per line:
+      E,<vehicle_no>,<type>[,y|n] Vehicle entry (optional 'y' marks a VIP/loyalty customer)
+      X,<vehicle_no>              Vehicle exit
+      S                           Print the parking status
+      R                           Print the daily revenue report
+    Blank lines and lines starting with '#' are ignored. Reads stdin unless a stream is given.
+    """
+    if stream is None:
+        stream = sys.stdin
+
+    succeeded = 0
+    failed = 0  # Well-formed commands the lot refused (unknown type, duplicate, not parked, full)
+    rejected = 0  # Lines that could not be parsed
+    for line_no, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+
+        fields = [field.strip() for field in line.split(',')]
+        command = fields[0].upper()
+        if command == 'E' and (len(fields) == 3 or len(fields) == 4 and fields[3].lower() in ('y', 'n')):
+            is_vip = len(fields) == 4 and fields[3].lower() == 'y'
+            ok = vehicle_entry(fields[1], fields[2], is_vip)
+        elif command == 'X' and len(fields) == 2:
+            ok = vehicle_exit(fields[1])
+        elif command == 'S' and len(fields) == 1:
+            display_status(clear=False)
+            ok = True
+        elif command == 'R' and len(fields) == 1:
+            display_daily_report(clear=False)
+            ok = True
+        else:
+            print(Colors.RED + f"\n[ERROR] Line {line_no}: unrecognized command '{line}'." + RESET)
+            rejected += 1
+            continue
+        if ok:
+            succeeded += 1
+        else:
+            failed += 1
+
+    occupied_count = OCCUPIED.count(1)
+    print(Colors.BLUE + Colors.BRIGHT + f"\n[BATCH] Succeeded {succeeded} command(s), failed {failed}, rejected {rejected}." + RESET)
+    print(Colors.BLUE + f"Occupied: {occupied_count} | Available: {total_capacity - occupied_count}" + RESET)
 
 
 # --- Main Application Loop ---
 
-def main_menu():
+MENU_TEXT = "\n".join([
+    Colors.YELLOW + Colors.BRIGHT + "\n\n--- MENU ---" + RESET,
+    Colors.GREEN + "1. Vehicle Entry" + RESET,
+    Colors.GREEN + "2. Vehicle Exit" + RESET,
+    Colors.GREEN + "3. View Parking Status (Current)" + RESET,
+    Colors.GREEN + "4. View Daily Revenue Report" + RESET,
+    Colors.RED + "5. Exit System" + RESET,
+    Colors.YELLOW + "--------------------------------------" + RESET,
+])
+
+def pause():
+    """Waits for Enter before returning to the menu. Returns False if the input stream closed."""
+    try:
+        input(Colors.YELLOW + "\nPress Enter to return to menu..." + RESET)
+    except EOFError:
+        return False
+    return True
+
+def main_menu(batch=False):
     """Displays the main CLI menu and handles user input."""
+    if os.name == 'nt':
+        os.system('') # Switches the Windows console into ANSI escape mode
     initialize_parking_lot() # Setup the lot on startup
+    replay_warnings = restore_state() # Bring back vehicles and revenue recorded before the last shutdown
+
+    # Piped/redirected input carries batch commands rather than a person at the menu
+    if batch or not sys.stdin.isatty():
+        if replay_warnings:
+            print("\n".join(replay_warnings))
+        batch_mode()
+        compact_journal()
+        return
 
+    # The dashboard is only re-rendered when occupancy changed (entry/exit) since it was last shown
+    needs_redraw = True
     while True:
-        display_status()
-        print(Colors.YELLOW + Colors.BRIGHT + "\n\n--- MENU ---" + Colors.RESET)
-        print(Colors.GREEN + "1. Vehicle Entry" + Colors.RESET)
-        print(Colors.GREEN + "2. Vehicle Exit" + Colors.RESET)
-        print(Colors.GREEN + "3. View Parking Status (Current)" + Colors.RESET)
-        print(Colors.GREEN + "4. View Daily Revenue Report" + Colors.RESET)
-        print(Colors.RED + "5. Exit System" + Colors.RESET)
-        print(Colors.YELLOW + "--------------------------------------" + Colors.RESET)
+        if needs_redraw:
+            display_status()
+            needs_redraw = False
+        if replay_warnings:
+            # Shown below the first dashboard, which would otherwise clear them off the screen
+            print("\n".join(replay_warnings))
+            replay_warnings = []
+        print(MENU_TEXT)
 
         try:
             choice = input(Colors.CYAN + "Enter your choice (1-5): " + Colors.WHITE).strip()
@@ -387,70 +718,54 @@ def main_menu():
             choice = int(choice)
         except EOFError:
             # Handle non-interactive execution environment closing the input stream
-            print(Colors.RED + "\n[SYSTEM] Input stream closed. Exiting gracefully." + Colors.RESET)
+            print(Colors.RED + "\n[SYSTEM] Input stream closed. Exiting gracefully." + RESET)
             break
         except ValueError:
-            print(Colors.RED + "\nInvalid input. Please enter a number between 1 and 5." + Colors.RESET)
+            print(Colors.RED + "\nInvalid input. Please enter a number between 1 and 5." + RESET)
             continue
 
         if choice == 1:
             clear_screen()
-            print(Colors.MAGENTA + Colors.BRIGHT + "--- VEHICLE ENTRY ---" + Colors.RESET)
+            print(Colors.MAGENTA + Colors.BRIGHT + "--- VEHICLE ENTRY ---" + RESET)
             v_no = input("Enter Vehicle Number: ").strip().upper()
             v_type = input("Enter Vehicle Type (BIKE/CAR/EV/HEAVY): ").strip().upper()
             is_vip_str = input("Is this a VIP/Loyalty Customer? (y/n): ").strip().lower()
             is_vip = is_vip_str == 'y'
             vehicle_entry(v_no, v_type, is_vip)
-            
-            # --- PAUSE ADDED ---
-            try:
-                input(Colors.YELLOW + "\nPress Enter to return to menu..." + Colors.RESET)
-            except EOFError:
+            if not pause():
                 break
-            # -------------------
+            needs_redraw = True
 
         elif choice == 2:
             clear_screen()
-            print(Colors.MAGENTA + Colors.BRIGHT + "--- VEHICLE EXIT ---" + Colors.RESET)
+            print(Colors.MAGENTA + Colors.BRIGHT + "--- VEHICLE EXIT ---" + RESET)
             v_no = input("Enter Vehicle Number to Exit: ").strip().upper()
             vehicle_exit(v_no)
-            
-            # --- PAUSE ADDED ---
-            try:
-                input(Colors.YELLOW + "\nPress Enter to return to menu..." + Colors.RESET)
-            except EOFError:
+            if not pause():
                 break
-            # -------------------
-            
+            needs_redraw = True
+
         elif choice == 3:
-            # Display status is already called at the start of the loop, but this forces a refresh/view
+            # Forces a fresh view; the menu then continues below it without rendering it again
             display_status()
-            
-            # --- PAUSE ADDED ---
-            try:
-                input(Colors.YELLOW + "\nPress Enter to return to menu..." + Colors.RESET)
-            except EOFError:
+            if not pause():
                 break
-            # -------------------
-            
+
         elif choice == 4:
             display_daily_report()
-            
-            # --- PAUSE ADDED ---
-            try:
-                input(Colors.YELLOW + "\nPress Enter to return to menu..." + Colors.RESET)
-            except EOFError:
+            if not pause():
                 break
-            # -------------------
-            
+
         elif choice == 5:
             clear_screen()
-            print(Colors.GREEN + Colors.BRIGHT + "Thank you for using the Smart Parking Management System. Goodbye!" + Colors.RESET)
+            print(Colors.GREEN + Colors.BRIGHT + "Thank you for using the Smart Parking Management System. Goodbye!" + RESET)
             break
 
         else:
-            print(Colors.RED + "\nInvalid choice. Please select a valid option (1-5)." + Colors.RESET)
+            print(Colors.RED + "\nInvalid choice. Please select a valid option (1-5)." + RESET)
 
+    # Graceful shutdown (menu option 5 or closed input): shrink the journal to a snapshot
+    compact_journal()
 
 if __name__ == "__main__":
-    main_menu()
\ No newline at end of file
+    main_menu(batch='--batch' in sys.argv[1:])
\ No newline at end of file
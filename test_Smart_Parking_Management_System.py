@@ -0,0 +1,186 @@
+import contextlib
+import datetime
+import io
+import os
+import tempfile
+import unittest
+
+import Smart_Parking_Management_System as spms
+
+
+def use_temp_journal(test):
+    """Points the journal at a fresh temporary file for the duration of one test."""
+    tmp = tempfile.TemporaryDirectory()
+    test.addCleanup(tmp.cleanup)
+    test.addCleanup(setattr, spms, 'JOURNAL_FILE', spms.JOURNAL_FILE)
+    spms.JOURNAL_FILE = os.path.join(tmp.name, 'journal.jsonl')
+    return tmp.name
+
+
+class JournalReplayTest(unittest.TestCase):
+    """Entries/exits written to the journal come back after a restart."""
+
+    def setUp(self):
+        self.tmp_dir = use_temp_journal(self)
+        self.restart()
+
+    def restart(self):
+        """Simulates a fresh process start and returns the replay warnings."""
+        spms.initialize_parking_lot()
+        return "\n".join(spms.restore_state())
+
+    def run_quietly(self, func, *args):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return func(*args)
+
+    def test_replay_survives_a_partial_line(self):
+        self.run_quietly(spms.vehicle_entry, 'A1', 'BIKE')
+        self.run_quietly(spms.vehicle_entry, 'A2', 'BIKE')
+        self.run_quietly(spms.vehicle_exit, 'A1')
+
+        # Crash mid-write: the last line is cut short and has no newline
+        with open(spms.JOURNAL_FILE, 'a') as journal:
+            journal.write('{"op": "entry", "slot')
+
+        self.restart()
+        self.run_quietly(spms.vehicle_entry, 'B1', 'EV')
+        self.run_quietly(spms.vehicle_entry, 'B2', 'HEAVY')
+
+        output = self.restart()
+        self.assertIn('[WARN] Journal line 4 is unreadable', output)
+        self.assertEqual(spms.VEHICLE_INDEX, {'A2': 'B-02', 'B1': 'E-01', 'B2': 'H-01'})
+        self.assertNotIn('E-01', spms.FREE['E'])
+        self.assertNotIn('H-01', spms.FREE['H'])
+        self.assertEqual(spms.revenue_count, 1)
+        self.run_quietly(spms.vehicle_exit, 'B2')
+        self.assertNotIn('B2', spms.VEHICLE_INDEX)
+
+    def test_replay_skips_malformed_events(self):
+        self.run_quietly(spms.vehicle_entry, 'A2', 'BIKE')
+        with open(spms.JOURNAL_FILE, 'a') as journal:
+            journal.write('{}\n[1]\n"x"\n')
+            journal.write('{"op": "entry", "slot_id": "C-01", "vehicle_no": "Z", "type": "TRUCK", "entry_ts": 0, "is_vip": false}\n')
+            journal.write('{"op": "exit", "vehicle_no": "A2", "exit_ts": "soon", "duration_hrs": 1, "fee": 5}\n')
+
+        warnings = self.restart()
+        for line_no in range(2, 7):
+            self.assertIn(f'[WARN] Journal line {line_no} is unreadable or malformed', warnings)
+        self.assertEqual(spms.VEHICLE_INDEX, {'A2': 'B-01'})
+        self.assertIn('C-01', spms.FREE['C'])
+        self.assertEqual(spms.revenue_count, 0)
+
+    def test_journal_write_failure_only_warns(self):
+        spms.JOURNAL_FILE = os.path.join(self.tmp_dir, 'missing-dir', 'journal.jsonl')
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            spms.vehicle_entry('C1', 'CAR')
+        self.assertIn('[WARN] Could not write to the journal', output.getvalue())
+        self.assertIn('C1', spms.VEHICLE_INDEX)
+
+    def test_compaction_keeps_parked_vehicles_and_every_held_exit(self):
+        # An exit from yesterday, then today's traffic
+        yesterday = int(datetime.datetime.now().timestamp()) - 24 * 3600
+        spms.log_revenue('C-09', 'OLD', spms.VT_CAR, yesterday - 3600, yesterday, 1, 99.0)
+        for vehicle_no in ('D1', 'D2', 'D3'):
+            self.run_quietly(spms.vehicle_entry, vehicle_no, 'CAR')
+        self.run_quietly(spms.vehicle_exit, 'D2')
+
+        spms.compact_journal()
+        with open(spms.JOURNAL_FILE) as journal:
+            self.assertEqual(len(journal.readlines()), 4)
+
+        self.restart()
+        self.assertEqual(spms.VEHICLE_INDEX, {'D1': 'C-01', 'D3': 'C-03'})
+        self.assertEqual(spms.revenue_count, 2)
+        self.assertEqual([spms.revenue_vehicle_nos[i] for i in spms.revenue_rows()], ['OLD', 'D2'])
+
+        # Yesterday's exit is kept but stays out of today's report
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            spms.display_daily_report(clear=False)
+        self.assertIn('$10.00', output.getvalue())
+        self.assertIn('Total Vehicles Processed: 1', output.getvalue())
+        self.assertNotIn('OLD', output.getvalue())
+
+
+class BatchModeTest(unittest.TestCase):
+    """Piped commands are applied and summarized without the menu."""
+
+    def setUp(self):
+        use_temp_journal(self)
+        spms.initialize_parking_lot()
+
+    def run_batch(self, text):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            spms.batch_mode(io.StringIO(text))
+        return output.getvalue()
+
+    def test_batch_summary_counts_failed_operations(self):
+        output = self.run_batch("E,abc,car\nE,abc,car\nE,x1,truck\nX,zzz\nbogus\n")
+        self.assertIn('[BATCH] Succeeded 1 command(s), failed 3, rejected 1.', output)
+        self.assertEqual(spms.VEHICLE_INDEX, {'ABC': 'C-01'})
+
+    def test_vip_flag_must_be_y_or_n(self):
+        output = self.run_batch("E,abc,car,yes\nE,def,car,N\nE,ghi,car,y\n")
+        self.assertIn("Line 1: unrecognized command 'E,abc,car,yes'", output)
+        self.assertIn('[BATCH] Succeeded 2 command(s), failed 0, rejected 1.', output)
+        self.assertEqual(spms.VEHICLE_INDEX, {'DEF': 'C-01', 'GHI': 'V-01'})
+
+
+class RevenueRingTest(unittest.TestCase):
+    """The revenue ring buffer keeps the latest REVENUE_CAP exits and their totals."""
+
+    def setUp(self):
+        self.original_cap = spms.REVENUE_CAP
+        spms.REVENUE_CAP = 3
+        self.addCleanup(setattr, spms, 'REVENUE_CAP', self.original_cap)
+        spms.initialize_parking_lot()
+
+    def log_exits(self, count, exit_ts=None):
+        if exit_ts is None:
+            exit_ts = int(datetime.datetime.now().timestamp())
+        for n in range(count):
+            spms.log_revenue('C-01', f'V{n}', spms.VT_CAR, exit_ts - 3600, exit_ts, n + 1, 10.0 * (n + 1))
+
+    def report(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            spms.display_daily_report(clear=False)
+        return output.getvalue()
+
+    def held_vehicles(self):
+        return [spms.revenue_vehicle_nos[i] for i in spms.revenue_rows()]
+
+    def test_rows_and_totals_before_wrapping(self):
+        self.log_exits(2)
+        self.assertEqual(self.held_vehicles(), ['V0', 'V1'])
+        self.assertEqual(spms.revenue_total_fee, 30.0)
+        self.assertEqual(spms.revenue_total_hours, 3)
+
+    def test_rows_and_totals_after_wrapping(self):
+        self.log_exits(5)
+        self.assertEqual(spms.revenue_count, 5)
+        self.assertEqual(self.held_vehicles(), ['V2', 'V3', 'V4'])
+        self.assertEqual(spms.revenue_total_fee, 30.0 + 40.0 + 50.0)
+        self.assertEqual(spms.revenue_total_hours, 3 + 4 + 5)
+
+        report = self.report()
+        self.assertIn('Total Revenue Earned (last 3 exits): ', report)
+        self.assertIn('$120.00', report)
+        self.assertNotIn('V1 ', report)
+
+    def test_totals_start_over_on_a_new_day(self):
+        yesterday = int(datetime.datetime.now().timestamp()) - 24 * 3600
+        self.log_exits(2, yesterday)
+        # Still running past midnight with no exits since: nothing to report for today
+        self.assertIn('No transactions recorded yet for the day.', self.report())
+
+        self.log_exits(2)
+        self.assertEqual(spms.revenue_total_fee, 30.0)
+        self.assertEqual([spms.revenue_vehicle_nos[i] for i in spms.revenue_rows(spms.revenue_day_start)], ['V0', 'V1'])
+        self.assertIn('Total Vehicles Processed: 2', self.report())
+
+
+if __name__ == '__main__':
+    unittest.main()